@@ -63,8 +63,11 @@ from __future__ import annotations
 
 import re
 import os
-import abc
+import sys
 import random
+import operator
+import functools
+import itertools
 
 from typing import Dict, List, Tuple, Union
 
@@ -76,17 +79,135 @@ from IDLParserTool.idl_types import IdlSequenceType
 from IDLParserTool.idl_types import IdlType
 from IDLParserTool.idl_types import IdlUnionType
 from IDLParserTool.idl_types import IdlPromiseType
+from IDLParserTool.idl_types import TYPE_NAMES
 
 from utils import NumberRangeEnd, NumberRange
 
 SPECIAL_KEYWORD_LIST = ['GETTER', 'SETTER', 'DELETER']
+_SPECIAL_KEYWORDS = {keyword: keyword.lower() for keyword in SPECIAL_KEYWORD_LIST}
+_SPECIAL_KEYS = frozenset(_SPECIAL_KEYWORDS)
+
+# Values of IdlArgument.arg_from
+ARG_FROM_NONE = ''
+ARG_FROM_THIS = 'this'
+ARG_FROM_OTHER = 'other'
+
+_NUM_ENUM_SHAPE = re.compile(r"\([\d,\s]+\)")
+_NUM_ENUM_DIGITS = re.compile(r"(\d+),?\s?")
+_CALL_AFTER_NAME = re.compile(r"[^,\s()\[\]]+")
+
+# Default for dict.pop() on extended attributes, whose values may be None.
+_MISSING = object()
 
 def ProcessNumberEnum(idl_type:IdlType, raw_value):
-    match = re.match(r"\([\d,\s]+\)", raw_value)
+    match = _NUM_ENUM_SHAPE.match(raw_value)
     assert match
-    str_values = re.findall(r"(\d+),?\s?", raw_value)
     caster = int if idl_type.is_integer_type else float
-    return [caster(i) for i in str_values]
+    return tuple(map(caster, _NUM_ENUM_DIGITS.findall(raw_value)))
+
+# Shared by every member without [NumberEnum]. number_enum is always a tuple,
+# so this one can't be mutated through any of them.
+_NO_NUMBER_ENUM = ()
+
+def _extract_number_meta(idl_type:IdlType, extended_attributes):
+    """Returns (number_range, number_enum) from [NumberRange] and [NumberEnum].
+
+    number_range is None unless the type is numeric and [NumberRange] is set.
+    """
+    if not extended_attributes:
+        return None, _NO_NUMBER_ENUM
+
+    number_range = None
+    raw_value = extended_attributes.get('NumberRange')
+    if raw_value is not None:
+        is_integer = idl_type.is_integer_type
+        if is_integer or idl_type.is_floating_type:
+            number_range = NumberRange.from_string(raw_value, is_float=not is_integer)
+            assert number_range
+
+    number_enum = _NO_NUMBER_ENUM
+    raw_value = extended_attributes.get('NumberEnum')
+    if raw_value is not None:
+        number_enum = ProcessNumberEnum(idl_type, raw_value)
+    return number_range, number_enum
+
+
+_ARG_FIELDS = operator.attrgetter('idl_type', 'default_value', 'is_optional')
+
+def _format_argument(arg, pos):
+    idl_type, default_value, is_optional = _ARG_FIELDS(arg)
+    return {
+        'Type': idl_type.name,
+        'RawType': str(idl_type),
+        'Default': default_value.value if default_value else None,
+        'Optional': is_optional,
+        'Pos': pos
+    }
+
+def _format_arguments(arguments):
+    return [_format_argument(arg, pos) for pos, arg in enumerate(arguments, 1)]
+
+def _format_interface(interface):
+    ext = interface.extended_attributes
+    ext_get = ext.get
+    exposures = ext_get('Exposed')
+    if not exposures:
+        exposures = []
+    interface_data = {
+        'Name': interface.name,
+        'Exposed': [ {'Name': exposure.exposed, 'RuntimeEnabled': exposure.runtime_enabled} for exposure in exposures ],
+        'Parent': '',
+        'Includes': [],
+        'Constructors': [],
+        'Attributes': [],
+        'Methods': [],
+        'IsMixin': interface.is_mixin,
+        'ImplementedAs': ext_get('ImplementedAs'),
+        'NoInterfaceObject': 'NoInterfaceObject' in ext,
+        'LegacyAlias': ext_get('LegacyWindowAlias') or ''
+    }
+    if interface.parent:
+        interface_data['Parent'] = interface.parent
+
+    for constructor in interface.constructors:
+        if constructor.name == 'NamedConstructor':
+            constructor_name = ext['NamedConstructor']
+        elif interface_data['NoInterfaceObject'] and interface_data['LegacyAlias']:
+            constructor_name = interface_data['LegacyAlias']
+        else:
+            constructor_name = interface.name
+        constructor_data = {
+            'Name':constructor_name,
+            'Arguments': _format_arguments(constructor.arguments)
+        }
+        interface_data['Constructors'].append(constructor_data)
+
+    for attr in interface.attributes:
+        attr_data = {
+            'Name': attr.name,
+            'Type': attr.idl_type.name,
+            'RawType': str(attr.idl_type),
+            'Readonly': attr.is_read_only,
+            'Static': attr.is_static
+        }
+        interface_data['Attributes'].append(attr_data)
+
+    for method in interface.operations:
+        method_data = {
+            'Name': method.name,
+            'Getter': method.is_getter,
+            'Setter': method.is_setter,
+            'Return': None,
+            'Arguments': _format_arguments(method.arguments)
+        }
+        return_data = {
+            'Type': method.idl_type.name,
+            'RawType': str(method.idl_type)
+        }
+
+        method_data['Return'] = return_data
+        interface_data['Methods'].append(method_data)
+    return interface_data
 
 ################################################################################
 # TypedObject
@@ -99,7 +220,7 @@ class TypedObject(object):
     The type can be an actual type, or can be a typedef, which must be resolved
     by the TypedefResolver before passing data to the code generator.
     """
-    __metaclass__ = abc.ABCMeta
+    __slots__ = ()
     idl_type_attributes = ('idl_type', )
 
 
@@ -126,30 +247,10 @@ class IdlDefinitions(object):
         children = node.GetChildren()
         for child in children:
             child_class = child.GetClass()
-            if child_class == 'Interface':
-                interface = IdlInterface(child)
-                self.interfaces[interface.name] = interface
-                if not self.first_name:
-                    self.first_name = interface.name
-            elif child_class == 'Typedef':
-                typedef = IdlTypedef(child)
-                self.typedefs[typedef.name] = typedef
-            elif child_class == 'Enum':
-                enumeration = IdlEnum(child)
-                self.enumerations[enumeration.name] = enumeration
-            elif child_class == 'Callback':
-                callback_function = IdlCallbackFunction(child)
-                self.callback_functions[callback_function.
-                                        name] = callback_function
-            elif child_class == 'Includes':
-                self.includes.append(IdlIncludes(child))
-            elif child_class == 'Dictionary':
-                dictionary = IdlDictionary(child)
-                self.dictionaries[dictionary.name] = dictionary
-                if not self.first_name:
-                    self.first_name = dictionary.name
-            else:
+            handler = _DEFINITIONS_CHILD_HANDLERS.get(child_class)
+            if handler is None:
                 raise ValueError('Unrecognized node class: %s' % child_class)
+            handler(self, child)
     
     @property
     def filepath(self):
@@ -170,28 +271,17 @@ class IdlDefinitions(object):
     def format_callbacks(self):
         callback_data_list = []
 
-        for _, callback in self.callback_functions.items():
+        for callback in self.callback_functions.values():
             callback_data = {
                 'Name': callback.name,
                 'Return': None,
-                'Arguments': []
+                'Arguments': _format_arguments(callback.arguments)
             }
             return_data = {
                 'Type': callback.idl_type.name,
                 'RawType': str(callback.idl_type)
             }
             callback_data['Return'] = return_data
-            arg_idx = 1
-            for arg in callback.arguments:
-                arg_data = {
-                    'Type': arg.idl_type.name,
-                    'RawType': str(arg.idl_type),
-                    'Default': arg.default_value.value if arg.default_value else None,
-                    'Optional': arg.is_optional,
-                    'Pos': arg_idx
-                }
-                arg_idx += 1
-                callback_data['Arguments'].append(arg_data)
             callback_data_list.append(callback_data)
 
         return callback_data_list
@@ -199,7 +289,7 @@ class IdlDefinitions(object):
     def format_typedefs(self):
         typedef_data_list = []
 
-        for _, typedef in self.typedefs.items():
+        for typedef in self.typedefs.values():
             typedef_data = {
                 'Name': typedef.name,
                 'Type': typedef.idl_type.name,
@@ -212,7 +302,7 @@ class IdlDefinitions(object):
     def format_enumerations(self):
         enumeration_data_list = []
 
-        for _, enumeration in self.enumerations.items():
+        for enumeration in self.enumerations.values():
             enumeration_data = {
                 'Name': enumeration.name,
                 'Values': []
@@ -244,91 +334,8 @@ class IdlDefinitions(object):
         return dictionary_data_list
 
     def format_interface(self):
-        interface_data_list = []
-        for name, interface in self.interfaces.items():
-            exposures = interface.extended_attributes.get('Exposed')
-            if not exposures:
-                exposures = []
-            interface_data = {
-                'Name': name,
-                'Exposed': [ {'Name': exposure.exposed, 'RuntimeEnabled': exposure.runtime_enabled} for exposure in exposures ],
-                'Parent': '',
-                'Includes': [],
-                'Constructors': [],
-                'Attributes': [],
-                'Methods': [],
-                'IsMixin': interface.is_mixin,
-                'ImplementedAs': interface.extended_attributes.get('ImplementedAs'),
-                'NoInterfaceObject': True if 'NoInterfaceObject' in interface.extended_attributes.keys() else False,
-                'LegacyAlias': interface.extended_attributes['LegacyWindowAlias'] if interface.extended_attributes.get('LegacyWindowAlias') else ''
-            }
-            if interface.parent:
-                interface_data['Parent'] = interface.parent
-
-            for constructor in interface.constructors:
-                if constructor.name == 'NamedConstructor':
-                    constructor_name = interface.extended_attributes['NamedConstructor']
-                elif interface_data['NoInterfaceObject'] and interface_data['LegacyAlias']:
-                    constructor_name = interface_data['LegacyAlias']
-                else:
-                    constructor_name = interface.name
-                constructor_data = {
-                    'Name':constructor_name,
-                    'Arguments': []
-                }
-                arg_idx = 1
-                for arg in constructor.arguments:
-                    arg_data = {
-                        'Type': arg.idl_type.name,
-                        'RawType': str(arg.idl_type),
-                        'Default': arg.default_value.value if arg.default_value else None,
-                        'Optional': arg.is_optional,
-                        'Pos': arg_idx
-                    }
-                    arg_idx += 1
-                    constructor_data['Arguments'].append(arg_data)
-                interface_data['Constructors'].append(constructor_data)
-
-            for attr in interface.attributes:
-                attr_data = {
-                    'Name': attr.name,
-                    'Type': attr.idl_type.name,
-                    'RawType': str(attr.idl_type),
-                    'Readonly': attr.is_read_only,
-                    'Static': attr.is_static
-                }
-                interface_data['Attributes'].append(attr_data)
-            
-            for method in interface.operations:
-                method_data = {
-                    'Name': method.name,
-                    'Getter': method.is_getter,
-                    'Setter': method.is_setter,
-                    'Return': None,
-                    'Arguments': []
-                }
-                return_data = {
-                    'Type': method.idl_type.name,
-                    'RawType': str(method.idl_type)
-                }
-
-                method_data['Return'] = return_data
-                arg_idx = 1
-                for arg in method.arguments:
-                    arg_data = {
-                        'Type': arg.idl_type.name,
-                        'RawType': str(arg.idl_type),
-                        'Default': arg.default_value.value if arg.default_value else None,
-                        'Optional': arg.is_optional,
-                        'Pos': arg_idx
-                    }
-                    arg_idx += 1
-                    method_data['Arguments'].append(arg_data)
-                interface_data['Methods'].append(method_data)
-            
-            interface_data_list.append(interface_data)
-
-        return interface_data_list
+        return [_format_interface(interface)
+                for interface in self.interfaces.values()]
 
     def accept(self, visitor):
         visitor.visit_definitions(self)
@@ -361,9 +368,53 @@ class IdlDefinitions(object):
                                 'but no existing interface by that name'.
                                 format(interface_name))
 
-            # Merge callbacks and enumerations
-            self.enumerations.update(other.enumerations)
-            self.callback_functions.update(other.callback_functions)
+        # Merge callbacks and enumerations
+        self.enumerations.update(other.enumerations)
+        self.callback_functions.update(other.callback_functions)
+
+
+def _add_interface(definitions, node):
+    interface = IdlInterface(node)
+    definitions.interfaces[interface.name] = interface
+    if not definitions.first_name:
+        definitions.first_name = interface.name
+
+
+def _add_typedef(definitions, node):
+    typedef = IdlTypedef(node)
+    definitions.typedefs[typedef.name] = typedef
+
+
+def _add_enumeration(definitions, node):
+    enumeration = IdlEnum(node)
+    definitions.enumerations[enumeration.name] = enumeration
+
+
+def _add_callback_function(definitions, node):
+    callback_function = IdlCallbackFunction(node)
+    definitions.callback_functions[callback_function.name] = callback_function
+
+
+def _add_includes(definitions, node):
+    definitions.includes.append(IdlIncludes(node))
+
+
+def _add_dictionary(definitions, node):
+    dictionary = IdlDictionary(node)
+    definitions.dictionaries[dictionary.name] = dictionary
+    if not definitions.first_name:
+        definitions.first_name = dictionary.name
+
+
+# Child node class of a 'File' node -> function adding it to IdlDefinitions.
+_DEFINITIONS_CHILD_HANDLERS = {
+    'Interface': _add_interface,
+    'Typedef': _add_typedef,
+    'Enum': _add_enumeration,
+    'Callback': _add_callback_function,
+    'Includes': _add_includes,
+    'Dictionary': _add_dictionary,
+}
 
 
 def arguments_node_to_arguments(node):
@@ -380,19 +431,20 @@ def arguments_node_to_arguments(node):
 ################################################################################
 
 class IdlCallbackFunction(TypedObject):
+    __slots__ = ('arguments', 'extended_attributes', 'idl_type', 'name')
+
     def __init__(self, node):
         children = node.GetChildren()
         num_children = len(children)
         if num_children < 2 or num_children > 3:
             raise ValueError('Expected 2 or 3 children, got %s' % num_children)
-        type_node = children[0]
-        arguments_node = children[1]
         if num_children == 3:
-            ext_attributes_node = children[2]
+            type_node, arguments_node, ext_attributes_node = children
             self.extended_attributes = (
                 ext_attributes_node_to_extended_attributes(ext_attributes_node)
             )
         else:
+            type_node, arguments_node = children
             self.extended_attributes = {}
         arguments_node_class = arguments_node.GetClass()
         if arguments_node_class != 'Arguments':
@@ -409,14 +461,13 @@ class IdlCallbackFunction(TypedObject):
             argument.accept(visitor)
 
     def __eq__(self, other):
-        if self.name == other.name and self.idl_type.name == other.idl_type.name and len(self.arguments) == len(other.arguments):
-            args_num = len(self.arguments)
-            for i in range(0, args_num):
-                if self.arguments[i] != other.arguments[i]:
-                    return False
+        if self is other:
             return True
-        else:
-            return False
+        return (
+            self.name == other.name
+            and self.idl_type.name == other.idl_type.name
+            and self.arguments == other.arguments
+        )
 
 ################################################################################
 # Dictionary
@@ -424,6 +475,9 @@ class IdlCallbackFunction(TypedObject):
 
 
 class IdlDictionary(object):
+    __slots__ = ('extended_attributes', 'idl_type', 'is_partial', 'members',
+                 'name', 'parent')
+
     def __init__(self, node):
         self.extended_attributes = {}
         self.is_partial = bool(node.GetProperty('PARTIAL'))
@@ -450,16 +504,15 @@ class IdlDictionary(object):
             member.accept(visitor)
 
     def __eq__(self, other):
-        if self.name == other.name and len(self.members) == len(other.members):
-            args_num = len(self.members)
-            for i in range(0, args_num):
-                if self.members[i] != other.members[i]:
-                    return False
+        if self is other:
             return True
-        else:
-            return False
+        return self.name == other.name and self.members == other.members
 
 class IdlDictionaryMember(TypedObject):
+    __slots__ = ('default_value', 'exclude_id', 'extended_attributes',
+                 'idl_type', 'is_required', 'name', 'number_enum',
+                 'number_range', 'value_only')
+
     def __init__(self, node):
         self.default_value = None
         self.extended_attributes = {}
@@ -492,24 +545,15 @@ class IdlDictionaryMember(TypedObject):
         self.exclude_id = self.extended_attributes.get('Exclude', '')
 
         # 当成员类型为数字类型时该扩展属性有效
-        self.number_range:NumberRange = None
-        if 'NumberRange' in self.extended_attributes and self.idl_type.is_numeric_type:
-            raw_value = self.extended_attributes['NumberRange']
-            if self.idl_type.is_integer_type:
-                self.number_range = NumberRange.from_string(raw_value, is_float=False)
-            elif self.idl_type.is_floating_type:
-                self.number_range = NumberRange.from_string(raw_value, is_float=True)
-            assert self.number_range
-        
-        self.number_enum:list = []
-        if 'NumberEnum' in self.extended_attributes:
-            raw_value = self.extended_attributes['NumberEnum']
-            self.number_enum = ProcessNumberEnum(self.idl_type, raw_value)
+        self.number_range, self.number_enum = _extract_number_meta(
+            self.idl_type, self.extended_attributes)
 
     def accept(self, visitor):
         visitor.visit_dictionary_member(self)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         return (
             self.name == other.name
             and self.idl_type.name == other.idl_type.name
@@ -521,6 +565,8 @@ class IdlDictionaryMember(TypedObject):
 
 
 class IdlEnum(object):
+    __slots__ = ('idl_type', 'name', 'values')
+
     def __init__(self, node):
         self.name = node.GetName()
         self.idl_type = IdlType(self.name)
@@ -538,13 +584,15 @@ class IdlEnum(object):
         return random.choice(self.values)
     
     def merge(self, other):
-        self.values.extend(other.values)
-        self.values = list(set(self.values))
+        # dict.fromkeys keeps the first occurrence, so the merged order is
+        # deterministic across runs.
+        self.values = list(dict.fromkeys(self.values + other.values))
 
 ################################################################################
 # Typedefs
 ################################################################################
 class IdlTypedef(object):
+    __slots__ = ('idl_type', 'name')
     idl_type_attributes = ('idl_type', )
 
     def __init__(self, node):
@@ -567,6 +615,10 @@ class IdlTypedef(object):
 # Arguments
 ################################################################################
 class IdlArgument(TypedObject):
+    __slots__ = ('arg_from', 'default_value', 'extended_attributes',
+                 'idl_type', 'is_optional', 'is_variadic', 'name',
+                 'number_enum', 'number_range')
+
     def __init__(self, node=None):
         self.extended_attributes = {}
         self.idl_type:IdlType = None
@@ -600,41 +652,32 @@ class IdlArgument(TypedObject):
             else:
                 raise ValueError('Unrecognized node class: %s' % child_class)
         
-        # 这个属性代表该参数来源只能是方法所在接口
+        # FromThis代表该参数来源只能是方法所在接口
         # 比如：存在一个RTCPeerConnection变量pc1，pc1.setLocalDescription参数来源只能是pc1.createOffer
         #      或者pc1.createAnswer
-        if 'FromThis' in self.extended_attributes:
-            self.arg_from = 'this'
-        # 这个属性代表该参数来源只能是方法所在的其他接口
+        # FromOther代表该参数来源只能是方法所在的其他接口
         # 比如：存在两个RTCPeerConnection变量pc1和pc2，pc1.setRemoteDescription参数来源只能是pc2.createOffer
         #      或者pc2.createAnswer
-        elif 'FromOther' in self.extended_attributes:
-            self.arg_from = 'other'
-        else:
-            self.arg_from = ''
+        self.arg_from = (
+            ARG_FROM_THIS if 'FromThis' in self.extended_attributes else
+            ARG_FROM_OTHER if 'FromOther' in self.extended_attributes else
+            ARG_FROM_NONE)
 
         # 当参数类型为数字类型时该扩展属性有效
-        self.number_range:tuple = tuple()
-        # 考虑开闭区间
-        if 'NumberRange' in self.extended_attributes and self.idl_type.is_numeric_type:
-            raw_value = self.extended_attributes['NumberRange']
-            if self.idl_type.is_integer_type:
-                self.number_range = NumberRange.from_string(raw_value, is_float=False)
-            elif self.idl_type.is_floating_type:
-                self.number_range = NumberRange.from_string(raw_value, is_float=True)
-            assert self.number_range
-        
         # 数字类型的固定枚举值，如果存在，那么在生成数字时会优先使用枚举值
-        self.number_enum:list = []
-        if 'NumberEnum' in self.extended_attributes:
-            raw_value = self.extended_attributes['NumberEnum']
-            self.number_enum = ProcessNumberEnum(self.idl_type, raw_value)
+        number_range, self.number_enum = _extract_number_meta(
+            self.idl_type, self.extended_attributes)
+        # 考虑开闭区间
+        self.number_range:tuple = (
+            number_range if number_range is not None else tuple())
 
 
     def accept(self, visitor):
         visitor.visit_argument(self)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         return (
             self.idl_type.name == other.idl_type.name
             and self.name == other.name
@@ -647,6 +690,11 @@ class IdlArgument(TypedObject):
 # Operations
 ################################################################################
 class IdlOperation(TypedObject):
+    __slots__ = ('arguments', 'call_after', 'defined_in', 'extended_attributes',
+                 'idl_type', 'is_clone', 'is_constructor', 'is_getter',
+                 'is_setter', 'is_static', 'name', 'node', 'specials', 'wait',
+                 'weight')
+
     def __init__(self, node=None):
         self.arguments:List[IdlArgument] = []
         self.extended_attributes = {}
@@ -664,24 +712,16 @@ class IdlOperation(TypedObject):
         if not node:
             return
         self.node = node
-        if self.node.GetProperties().get('GETTER') is True:
-            self.is_getter = True
-        else:
-            self.is_getter = False
-        
-        if self.node.GetProperties().get('SETTER') is True:
-            self.is_setter = True
-        else:
-            self.is_setter = False
+        property_dictionary = node.GetProperties()
+        self.is_getter = bool(property_dictionary.get('GETTER'))
+        self.is_setter = bool(property_dictionary.get('SETTER'))
 
         self.name = node.GetName()
         self.is_clone = self.name == 'clone'
 
-        self.is_static = bool(node.GetProperty('STATIC'))
-        property_dictionary = node.GetProperties()
-        for special_keyword in SPECIAL_KEYWORD_LIST:
-            if special_keyword in property_dictionary:
-                self.specials.append(special_keyword.lower())
+        self.is_static = bool(property_dictionary.get('STATIC'))
+        self.specials = [_SPECIAL_KEYWORDS[keyword] for keyword in
+                         _SPECIAL_KEYS.intersection(property_dictionary)]
 
         children = node.GetChildren()
         for child in children:
@@ -702,7 +742,7 @@ class IdlOperation(TypedObject):
 
         if 'CallAfter' in self.extended_attributes:
             raw_text = self.extended_attributes['CallAfter']
-            self.call_after = raw_text[1:-1].replace(' ', '').split(',')
+            self.call_after = _CALL_AFTER_NAME.findall(raw_text)
 
         # 调用几率，范围设定为[0, 10)，不支持浮点数
         self.weight = int(self.extended_attributes.get('Weight', '10'))
@@ -714,7 +754,10 @@ class IdlOperation(TypedObject):
         return self.__repr__()
 
     def __hash__(self):
-        return hash(str([self.name, self.defined_in.name, self.arguments]))
+        defined_in = self.defined_in.name if self.defined_in else None
+        return hash((self.name, defined_in,
+                     tuple((arg.idl_type.name, arg.name)
+                           for arg in self.arguments)))
 
     def __eq__(self, other):
         '''
@@ -722,17 +765,9 @@ class IdlOperation(TypedObject):
             * number of arguments
             * argument
         '''
-        if self.name != other.name:
-            return False
-        
-        if len(self.arguments) != len(other.arguments):
-            return False
-        
-        for i in range(0, len(self.arguments)):
-            if self.arguments[i] != other.arguments[i]:
-                return False
-        
-        return True
+        if self is other:
+            return True
+        return self.name == other.name and self.arguments == other.arguments
 
     @classmethod
     def constructor_from_arguments_node(cls, name, arguments_node):
@@ -766,6 +801,15 @@ class IdlOperation(TypedObject):
 # Interfaces
 ################################################################################
 class IdlInterface(object):
+    __slots__ = ('attributes', 'attributes_dict', 'attributes_type_dict',
+                 'constants', 'constructors', 'custom_constructors',
+                 'event_handler', 'eventhandlers', 'extended_attributes',
+                 'has_indexed_elements', 'has_named_property_getter',
+                 'idl_type', 'is_callback', 'is_mixin', 'is_partial',
+                 'iterable', 'maplike', 'name', 'node', 'operations',
+                 'operations_dict', 'original_interface', 'parent',
+                 'partial_interfaces', 'setlike', 'stringifier')
+
     def __init__(self, node):
         self.node                           = node
         self.attributes:list[IdlAttribute]  = []
@@ -789,104 +833,27 @@ class IdlInterface(object):
         self.original_interface             = None
         self.partial_interfaces             = []
 
-        self.is_callback                    = bool(node.GetProperty('CALLBACK'))
+        property_dictionary                 = node.GetProperties()
+        self.is_callback                    = bool(property_dictionary.get('CALLBACK'))
         self.event_handler                  = None
-        self.is_partial                     = bool(node.GetProperty('PARTIAL'))
-        self.is_mixin                       = bool(node.GetProperty('MIXIN'))
+        self.is_partial                     = bool(property_dictionary.get('PARTIAL'))
+        self.is_mixin                       = bool(property_dictionary.get('MIXIN'))
         self.name:str                           = node.GetName()
         self.idl_type:IdlType                       = IdlType(self.name)
 
         self.eventhandlers                  = []
 
-        has_indexed_property_getter         = False
-        has_integer_typed_length            = False
-
-        # These are used to support both constructor operations and old style
-        # [Constructor] extended attributes. Ideally we should do refactoring
-        # for constructor code generation but we will use a new code generator
-        # soon so this kind of workaround should be fine.
-        constructor_operations              = []
-        custom_constructor_operations       = []
-        constructor_operations_extended_attributes = {}
-
-        def is_invalid_attribute_type(idl_type):
-            return idl_type.is_callback_function or \
-                idl_type.is_dictionary or \
-                idl_type.is_record_type or \
-                idl_type.is_sequence_type
-
+        state = _InterfaceChildState()
         children = node.GetChildren()
         for child in children:
             child_class = child.GetClass()
-            if child_class == 'Attribute':
-                attr = IdlAttribute(child)
-                if is_invalid_attribute_type(attr.idl_type):
-                    raise ValueError(
-                        'Type "%s" cannot be used as an attribute.' %
-                        attr.idl_type)
-                if attr.idl_type.is_integer_type and attr.name == 'length':
-                    has_integer_typed_length = True
-                attr.defined_in = self
-                self.attributes.append(attr)
-                if not self.attributes_type_dict.get(attr.idl_type.name):
-                    self.attributes_type_dict[attr.idl_type.name] = []
-                self.attributes_dict[attr.name] = attr # 属性不可能重名
-                self.attributes_type_dict[attr.idl_type.name].append(attr)
-                if attr.is_eventhandler:
-                    self.eventhandlers.append(attr)
-            elif child_class == 'Const':
-                self.constants.append(IdlConstant(child))
-            elif child_class == 'ExtAttributes':
-                extended_attributes = ext_attributes_node_to_extended_attributes(
-                    child)
-                self.constructors, self.custom_constructors = (
-                    extended_attributes_to_constructors(extended_attributes))
-                clear_constructor_attributes(extended_attributes)
-                self.extended_attributes = extended_attributes
-            elif child_class == 'Operation':
-                op = IdlOperation(child)
-                if 'getter' in op.specials:
-                    if str(op.arguments[0].idl_type) == 'unsigned long':
-                        has_indexed_property_getter = True
-                    elif str(op.arguments[0].idl_type) == 'DOMString':
-                        self.has_named_property_getter = True
-                # find handleEvent operation
-                if op.name == 'handleEvent':
-                    if self.event_handler:
-                        raise Exception(f"Duplicate handleEvent for {self.name}")
-                    self.event_handler = op
-                op.defined_in = self
-                self.operations.append(op)
-
-            elif child_class == 'Constructor':
-                operation = constructor_operation_from_node(child)
-                if operation.is_custom:
-                    custom_constructor_operations.append(operation.constructor)
-                else:
-                    # Check extended attributes consistency when we previously
-                    # handle constructor operations.
-                    if constructor_operations:
-                        check_constructor_operations_extended_attributes(
-                            constructor_operations_extended_attributes,
-                            operation.extended_attributes)
-                    constructor_operations.append(operation.constructor)
-                    constructor_operations_extended_attributes.update(
-                        operation.extended_attributes)
-            elif child_class == 'Inherit':
-                self.parent = child.GetName()
-            elif child_class == 'Stringifier':
-                self.stringifier = IdlStringifier(child)
-                self.process_stringifier()
-            elif child_class == 'Iterable':
-                self.iterable = IdlIterable(child)
-            elif child_class == 'Maplike':
-                self.maplike = IdlMaplike(child)
-            elif child_class == 'Setlike':
-                self.setlike = IdlSetlike(child)
-            else:
+            handler = _INTERFACE_CHILD_HANDLERS.get(child_class)
+            if handler is None:
                 raise ValueError('Unrecognized node class: %s' % child_class)
+            handler(self, child, state)
 
-        if len(list(filter(None, [self.iterable, self.maplike, self.setlike]))) > 1:
+        if (self.iterable is not None) + (self.maplike is not None) + \
+           (self.setlike is not None) > 1:
             raise ValueError(
                 'Interface can only have one of iterable<>, maplike<> and setlike<>.'
             )
@@ -901,7 +868,7 @@ class IdlInterface(object):
                 '[LegacyUnenumerableNamedProperties] can be used only in interfaces '
                 'that support named properties.')
 
-        if has_integer_typed_length and has_indexed_property_getter:
+        if state.has_integer_typed_length and state.has_indexed_property_getter:
             self.has_indexed_elements = True
         else:
             if self.iterable is not None and self.iterable.key_type is None:
@@ -912,6 +879,8 @@ class IdlInterface(object):
         if 'Unforgeable' in self.extended_attributes:
             raise ValueError('[Unforgeable] cannot appear on interfaces.')
 
+        constructor_operations = state.constructor_operations
+        custom_constructor_operations = state.custom_constructor_operations
         if constructor_operations or custom_constructor_operations:
             if self.constructors or self.custom_constructors:
                 raise ValueError('Detected mixed [Constructor] and consructor '
@@ -919,9 +888,8 @@ class IdlInterface(object):
                                  'interface.')
             extended_attributes = (
                 convert_constructor_operations_extended_attributes(
-                    constructor_operations_extended_attributes))
-            if any(name in extended_attributes.keys()
-                   for name in self.extended_attributes.keys()):
+                    state.constructor_operations_extended_attributes))
+            if extended_attributes.keys() & self.extended_attributes.keys():
                 raise ValueError('Detected mixed extended attributes for '
                                  'both [Constructor] and constructor '
                                  'operations. Do not use both in a single '
@@ -955,7 +923,18 @@ class IdlInterface(object):
         if self.stringifier.attribute:
             self.attributes.append(self.stringifier.attribute)
         elif self.stringifier.operation:
-            self.operations.append(self.stringifier.operation)
+            self._add_operation(self.stringifier.operation)
+
+    def _add_operation(self, op:IdlOperation):
+        self.operations.append(op)
+        self.operations_dict.setdefault(op.name, []).append(op)
+
+    def _bulk_add_operations(self, ops):
+        """Appends |ops| in one go and indexes them in operations_dict."""
+        operations_dict = self.operations_dict
+        self.operations.extend(ops)
+        for op in ops:
+            operations_dict.setdefault(op.name, []).append(op)
 
     def has_attr(self, attr_name:str):
         return attr_name in self.attributes_dict
@@ -966,14 +945,23 @@ class IdlInterface(object):
     def update_attribute(self, attr:IdlAttribute):
         self.attributes.append(attr)
         self.attributes_dict[attr.name] = attr
-        if not self.attributes_type_dict.get(attr.idl_type.name):
-            self.attributes_type_dict[attr.idl_type.name] = []
-        self.attributes_type_dict[attr.idl_type.name].append(attr)
+        self.attributes_type_dict.setdefault(attr.idl_type.name, []).append(attr)
+
+    def _bulk_add_attributes(self, attrs):
+        """Adds |attrs|, skipping any whose name is already present."""
+        attributes = self.attributes
+        attributes_dict = self.attributes_dict
+        attributes_type_dict = self.attributes_type_dict
+        for attr in attrs:
+            if attr.name in attributes_dict:
+                continue
+            attributes_dict[attr.name] = attr
+            attributes.append(attr)
+            attributes_type_dict.setdefault(attr.idl_type.name, []).append(attr)
 
     def merge(self, other:IdlInterface):
         """Merge in another interface's members (e.g., partial interface)"""
-        for attr in other.attributes:
-            self.update_attribute(attr)
+        self._bulk_add_attributes(other.attributes)
         # self.attributes.extend(other.attributes)
         # self.attributes_dict.update(other.attributes_dict)
         # for k,v in other.attributes_type_dict.items():
@@ -982,21 +970,20 @@ class IdlInterface(object):
         #     self.attributes_type_dict[k].extend(v)
 
         self.constants.extend(other.constants)
-        for op in other.operations:
-            # op.defined_in = self # TODO: 应该在defined_in中记录下父类的信息
-            self.operations.append(op)
+        # TODO: 应该在defined_in中记录下父类的信息
+        self._bulk_add_operations(other.operations)
         self.constructors.extend(other.constructors)
         self.eventhandlers.extend(other.eventhandlers)
         
+        extended_attributes = self.extended_attributes
         for k, v in other.extended_attributes.items():
-            if not self.extended_attributes.get(k):
-                self.extended_attributes[k] = v
+            if k not in extended_attributes:
+                extended_attributes[k] = v
             elif k == 'Exposed':
-                self.extended_attributes[k] = list(set(
-                    self.extended_attributes[k] + v
-                ))
+                extended_attributes[k] = _merge_exposed(
+                    extended_attributes[k], v)
             # TODO: 合并时处理其余扩展属性
-            elif v != self.extended_attributes[k]:
+            elif v != extended_attributes[k]:
                 # error_msg = f"Partial interface {self.name} has different extended attribute {k}: {v} | {self.extended_attributes[k]}"
                 # print(error_msg)
                 # raise Exception(error_msg)
@@ -1008,71 +995,197 @@ class IdlInterface(object):
     def inherite(self, parent:IdlInterface):
         self.eventhandlers.extend(parent.eventhandlers)
 
-        for attr in parent.attributes:
-            # 不继承重名的属性
-            if self.has_attr(attr.name):
-                continue
-            self.update_attribute(attr)
+        # 不继承重名的属性
+        self._bulk_add_attributes(parent.attributes)
         
         # 支持重写父类方法
+        # 只继承每个未被重写的方法名的第一个重载
+        operations_dict = self.operations_dict
+        inherited_ops = {}
         for op in parent.operations:
-            overwrite = False
-            for exist_op in self.operations:
-                if op.name == exist_op.name:
-                    overwrite = True
-                    break
-            if not overwrite:
-                # op.defined_in = self
-                self.operations.append(op)
+            if op.name not in operations_dict:
+                inherited_ops.setdefault(op.name, op)
+        self._bulk_add_operations(inherited_ops.values())
         
         self.constants.extend(parent.constants)
+        extended_attributes = self.extended_attributes
         for k, v in parent.extended_attributes.items():
-            if not self.extended_attributes.get(k):
-                self.extended_attributes[k] = v
+            if k not in extended_attributes:
+                extended_attributes[k] = v
             elif k == 'Exposed':
-                self.extended_attributes[k] = list(set(
-                    self.extended_attributes[k] + v
-                ))
-            elif v != self.extended_attributes[k]:
-                pass
+                extended_attributes[k] = _merge_exposed(
+                    extended_attributes[k], v)
 
         if self.stringifier is None:
             self.stringifier = parent.stringifier
 
     def operations_to_dict(self):
-        for op in self.operations:
-            ops = self.operations_dict.get(op.name)
-            if ops:
-                ops.append(op)
-            else:
-                self.operations_dict[op.name] = [op]
+        """Kept for compatibility: operations_dict is updated whenever an
+        operation is added, so there is nothing left to build.
+
+        Operations must be added through _add_operation() or
+        _bulk_add_operations(); appending to self.operations directly leaves
+        operations_dict without them."""
 
     def is_subclass_of(self, maybe_parent:Union[str, IdlInterface]) -> bool:
         '''判断某个接口是否为本接口的基类,为了准确表达语义,两接口相等时返回False'''
         i = self.parent
-        while i:
-            assert type(i) is IdlInterface # 只有在parent被修正为IdlInterface时才可使用此方法
-            if type(maybe_parent) is str:
-                parent_info = i.name
-            else:
-                parent_info = i
-            if maybe_parent == parent_info:
-                return True
-            i = i.parent
+        assert i is None or type(i) is IdlInterface # 只有在parent被修正为IdlInterface时才可使用此方法
+        if isinstance(maybe_parent, str):
+            while i is not None:
+                if i.name == maybe_parent:
+                    return True
+                i = i.parent
+        else:
+            while i is not None:
+                if i is maybe_parent:
+                    return True
+                i = i.parent
         return False
     
     def parent_name(self) -> str:
-        if type(self.parent) is str:
-            return self.parent
-        elif type(self.parent) is IdlInterface:
-            return self.parent.name
+        parent = self.parent
+        parent_type = type(parent)
+        if parent_type is str:
+            return parent
+        elif parent_type is IdlInterface:
+            return parent.name
         else:
             raise Exception(f"Wrong parent type of interface {self.name}")
 
+
+class _InterfaceChildState(object):
+    """Bookkeeping shared by the IdlInterface child handlers while a single
+    interface node is being converted."""
+
+    def __init__(self):
+        self.has_indexed_property_getter = False
+        self.has_integer_typed_length = False
+
+        # These are used to support both constructor operations and old style
+        # [Constructor] extended attributes. Ideally we should do refactoring
+        # for constructor code generation but we will use a new code generator
+        # soon so this kind of workaround should be fine.
+        self.constructor_operations = []
+        self.custom_constructor_operations = []
+        self.constructor_operations_extended_attributes = {}
+
+
+def is_invalid_attribute_type(idl_type):
+    return idl_type.is_callback_function or \
+        idl_type.is_dictionary or \
+        idl_type.is_record_type or \
+        idl_type.is_sequence_type
+
+
+def _interface_attribute(interface, node, state):
+    attr = IdlAttribute(node)
+    if is_invalid_attribute_type(attr.idl_type):
+        raise ValueError(
+            'Type "%s" cannot be used as an attribute.' % attr.idl_type)
+    if attr.idl_type.is_integer_type and attr.name == 'length':
+        state.has_integer_typed_length = True
+    attr.defined_in = interface
+    interface.attributes.append(attr)
+    interface.attributes_dict[attr.name] = attr # 属性不可能重名
+    interface.attributes_type_dict.setdefault(attr.idl_type.name, []).append(attr)
+    if attr.is_eventhandler:
+        interface.eventhandlers.append(attr)
+
+
+def _interface_const(interface, node, state):
+    interface.constants.append(IdlConstant(node))
+
+
+def _interface_ext_attributes(interface, node, state):
+    extended_attributes = ext_attributes_node_to_extended_attributes(node)
+    interface.constructors, interface.custom_constructors = (
+        extended_attributes_to_constructors(extended_attributes))
+    clear_constructor_attributes(extended_attributes)
+    interface.extended_attributes = extended_attributes
+
+
+def _interface_operation(interface, node, state):
+    op = IdlOperation(node)
+    if 'getter' in op.specials and op.arguments:
+        key_type = str(op.arguments[0].idl_type)
+        if key_type == 'unsigned long':
+            state.has_indexed_property_getter = True
+        elif key_type == 'DOMString':
+            interface.has_named_property_getter = True
+    # find handleEvent operation
+    if op.name == 'handleEvent':
+        if interface.event_handler:
+            raise Exception(f"Duplicate handleEvent for {interface.name}")
+        interface.event_handler = op
+    op.defined_in = interface
+    interface._add_operation(op)
+
+
+def _interface_constructor(interface, node, state):
+    operation = constructor_operation_from_node(node)
+    if operation.is_custom:
+        state.custom_constructor_operations.append(operation.constructor)
+    else:
+        # Check extended attributes consistency when we previously
+        # handle constructor operations.
+        if state.constructor_operations:
+            check_constructor_operations_extended_attributes(
+                state.constructor_operations_extended_attributes,
+                operation.extended_attributes)
+        state.constructor_operations.append(operation.constructor)
+        state.constructor_operations_extended_attributes.update(
+            operation.extended_attributes)
+
+
+def _interface_inherit(interface, node, state):
+    interface.parent = node.GetName()
+
+
+def _interface_stringifier(interface, node, state):
+    interface.stringifier = IdlStringifier(node)
+    interface.process_stringifier()
+
+
+def _interface_iterable(interface, node, state):
+    interface.iterable = IdlIterable(node)
+
+
+def _interface_maplike(interface, node, state):
+    interface.maplike = IdlMaplike(node)
+
+
+def _interface_setlike(interface, node, state):
+    interface.setlike = IdlSetlike(node)
+
+
+# Child node class of an 'Interface' node -> function adding it to IdlInterface.
+_INTERFACE_CHILD_HANDLERS = {
+    'Attribute': _interface_attribute,
+    'Const': _interface_const,
+    'ExtAttributes': _interface_ext_attributes,
+    'Operation': _interface_operation,
+    'Constructor': _interface_constructor,
+    'Inherit': _interface_inherit,
+    'Stringifier': _interface_stringifier,
+    'Iterable': _interface_iterable,
+    'Maplike': _interface_maplike,
+    'Setlike': _interface_setlike,
+}
+
+
+def _merge_exposed(exposures, other_exposures):
+    """Order-preserving union of two [Exposed] lists."""
+    return list(dict.fromkeys(itertools.chain(exposures, other_exposures)))
+
 ################################################################################
 # Attributes
 ################################################################################
 class IdlAttribute(TypedObject):
+    __slots__ = ('defined_in', 'event_type', 'extended_attributes', 'idl_type',
+                 'is_eventhandler', 'is_read_only', 'is_static', 'name',
+                 'number_enum', 'number_range')
+
     def __init__(self, node=None):
         self.is_read_only = bool(
             node.GetProperty('READONLY')) if node else False
@@ -1110,19 +1223,8 @@ class IdlAttribute(TypedObject):
         else:
             self.is_eventhandler = False
         
-        self.number_range:NumberRange = None
-        if 'NumberRange' in self.extended_attributes and self.idl_type.is_numeric_type:
-            raw_value = self.extended_attributes['NumberRange']
-            if self.idl_type.is_integer_type:
-                self.number_range = NumberRange.from_string(raw_value, is_float=False)
-            elif self.idl_type.is_floating_type:
-                self.number_range = NumberRange.from_string(raw_value, is_float=True)
-            assert self.number_range
-        
-        self.number_enum:list = []
-        if 'NumberEnum' in self.extended_attributes:
-            raw_value = self.extended_attributes['NumberEnum']
-            self.number_enum = ProcessNumberEnum(self.idl_type, raw_value)
+        self.number_range, self.number_enum = _extract_number_meta(
+            self.idl_type, self.extended_attributes)
 
     def accept(self, visitor):
         visitor.visit_attribute(self)
@@ -1133,16 +1235,19 @@ class IdlAttribute(TypedObject):
     def __str__(self):
         return self.__repr__()
 
+    def _key(self):
+        # Computed on demand: attributes built without a node get their name
+        # and idl_type assigned after construction. defined_in is
+        # deliberately not part of the key.
+        idl_type = self.idl_type
+        return (self.name, idl_type.name if idl_type is not None else None)
+
     def __eq__(self, other):
-        if self.idl_type.name != other.idl_type.name:
-            return False
-        if self.name != other.name:
-            return False
-        
-        # if self.defined_in and other.defined_in:
-        #     if self.defined_in.name != other.defined_in.name:
-        #         return False
-        return True
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
 
 ################################################################################
 # Constants
@@ -1150,13 +1255,19 @@ class IdlAttribute(TypedObject):
 
 
 class IdlConstant(TypedObject):
+    __slots__ = ('defined_in', 'extended_attributes', 'idl_type', 'name',
+                 'value')
+
     def __init__(self, node):
         children = node.GetChildren()
         num_children = len(children)
         if num_children < 2 or num_children > 3:
             raise ValueError('Expected 2 or 3 children, got %s' % num_children)
-        type_node = children[0]
-        value_node = children[1]
+        if num_children == 3:
+            type_node, value_node, ext_attributes_node = children
+        else:
+            type_node, value_node = children
+            ext_attributes_node = None
         value_node_class = value_node.GetClass()
         if value_node_class != 'Value':
             raise ValueError('Expected Value node, got %s' % value_node_class)
@@ -1170,8 +1281,7 @@ class IdlConstant(TypedObject):
         # attribute is inherited from an ancestor interface.
         self.defined_in = None
 
-        if num_children == 3:
-            ext_attributes_node = children[2]
+        if ext_attributes_node is not None:
             self.extended_attributes = ext_attributes_node_to_extended_attributes(
                 ext_attributes_node)
         else:
@@ -1186,30 +1296,34 @@ class IdlConstant(TypedObject):
 ################################################################################
 
 
+# Literal idl_type -> function rendering the value as C++ source.
+_LITERAL_FORMATTERS = {
+    'DOMString': lambda value: f'"{value}"' if value else 'WTF::g_empty_string',
+    'integer': lambda value: f'{value:d}',
+    'float': lambda value: f'{value:g}',
+    'boolean': lambda value: 'true' if value else 'false',
+    'dictionary': lambda value: value,
+}
+
+
 class IdlLiteral(object):
+    __slots__ = ('idl_type', 'is_null', 'value')
+
     def __init__(self, idl_type, value):
         self.idl_type = idl_type
         self.value = value
         self.is_null = False
 
     def __str__(self):
-        if self.idl_type == 'DOMString':
-            if self.value:
-                return '"%s"' % self.value
-            else:
-                return 'WTF::g_empty_string'
-        if self.idl_type == 'integer':
-            return '%d' % self.value
-        if self.idl_type == 'float':
-            return '%g' % self.value
-        if self.idl_type == 'boolean':
-            return 'true' if self.value else 'false'
-        if self.idl_type == 'dictionary':
-            return self.value
-        raise ValueError('Unsupported literal type: %s' % self.idl_type)
+        formatter = _LITERAL_FORMATTERS.get(self.idl_type)
+        if formatter is None:
+            raise ValueError('Unsupported literal type: %s' % self.idl_type)
+        return formatter(self.value)
 
 
 class IdlLiteralNull(IdlLiteral):
+    __slots__ = ()
+
     def __init__(self):
         self.idl_type = 'NULL'
         self.value = None
@@ -1219,24 +1333,42 @@ class IdlLiteralNull(IdlLiteral):
         return 'nullptr'
 
 
+def _string_literal(value):
+    if '"' in value or '\\' in value:
+        raise ValueError('Unsupported string value: %r' % value)
+    return IdlLiteral('DOMString', value)
+
+
+def _integer_literal(value):
+    return IdlLiteral('integer', int(value, base=0))
+
+
+def _float_literal(value):
+    return IdlLiteral('float', float(value))
+
+
+def _null_literal(value):
+    return IdlLiteralNull()
+
+
+# Default value TYPE -> builder taking the raw VALUE property.
+_LITERAL_BUILDERS = {
+    'DOMString': _string_literal,
+    'integer': _integer_literal,
+    'float': _float_literal,
+    'boolean': functools.partial(IdlLiteral, 'boolean'),
+    'sequence': functools.partial(IdlLiteral, 'sequence'),
+    'NULL': _null_literal,
+    'dictionary': functools.partial(IdlLiteral, 'dictionary'),
+}
+
+
 def default_node_to_idl_literal(node):
     idl_type = node.GetProperty('TYPE')
-    value = node.GetProperty('VALUE')
-    if idl_type == 'DOMString':
-        if '"' in value or '\\' in value:
-            raise ValueError('Unsupported string value: %r' % value)
-        return IdlLiteral(idl_type, value)
-    if idl_type == 'integer':
-        return IdlLiteral(idl_type, int(value, base=0))
-    if idl_type == 'float':
-        return IdlLiteral(idl_type, float(value))
-    if idl_type in ['boolean', 'sequence']:
-        return IdlLiteral(idl_type, value)
-    if idl_type == 'NULL':
-        return IdlLiteralNull()
-    if idl_type == 'dictionary':
-        return IdlLiteral(idl_type, value)
-    raise ValueError('Unrecognized default value type: %s' % idl_type)
+    builder = _LITERAL_BUILDERS.get(idl_type)
+    if builder is None:
+        raise ValueError('Unrecognized default value type: %s' % idl_type)
+    return builder(node.GetProperty('VALUE'))
 
 
 ################################################################################
@@ -1245,6 +1377,8 @@ def default_node_to_idl_literal(node):
 
 
 class IdlStringifier(object):
+    __slots__ = ('attribute', 'extended_attributes', 'operation')
+
     def __init__(self, node):
         self.attribute = None
         self.operation = None
@@ -1277,6 +1411,8 @@ class IdlStringifier(object):
 
 
 class IdlIterableOrMaplikeOrSetlike(TypedObject):
+    __slots__ = ('extended_attributes', 'type_children')
+
     def __init__(self, node):
         self.extended_attributes = {}
         self.type_children = []
@@ -1293,20 +1429,24 @@ class IdlIterableOrMaplikeOrSetlike(TypedObject):
 
 
 class IdlIterable(IdlIterableOrMaplikeOrSetlike):
+    __slots__ = ('key_type', 'value_type')
     idl_type_attributes = ('key_type', 'value_type')
 
     def __init__(self, node):
         super(IdlIterable, self).__init__(node)
 
-        if len(self.type_children) == 1:
+        type_children = self.type_children
+        num_type_children = len(type_children)
+        if num_type_children == 1:
             self.key_type = None
-            self.value_type = type_node_to_type(self.type_children[0])
-        elif len(self.type_children) == 2:
-            self.key_type = type_node_to_type(self.type_children[0])
-            self.value_type = type_node_to_type(self.type_children[1])
+            self.value_type = type_node_to_type(type_children[0])
+        elif num_type_children == 2:
+            key_node, value_node = type_children
+            self.key_type = type_node_to_type(key_node)
+            self.value_type = type_node_to_type(value_node)
         else:
-            raise ValueError('Unexpected number of type children: %d' % len(
-                self.type_children))
+            raise ValueError('Unexpected number of type children: %d' %
+                             num_type_children)
         del self.type_children
 
     def accept(self, visitor):
@@ -1314,6 +1454,7 @@ class IdlIterable(IdlIterableOrMaplikeOrSetlike):
 
 
 class IdlMaplike(IdlIterableOrMaplikeOrSetlike):
+    __slots__ = ('is_read_only', 'key_type', 'value_type')
     idl_type_attributes = ('key_type', 'value_type')
 
     def __init__(self, node):
@@ -1321,9 +1462,11 @@ class IdlMaplike(IdlIterableOrMaplikeOrSetlike):
 
         self.is_read_only = bool(node.GetProperty('READONLY'))
 
-        if len(self.type_children) == 2:
-            self.key_type = type_node_to_type(self.type_children[0])
-            self.value_type = type_node_to_type(self.type_children[1])
+        type_children = self.type_children
+        if len(type_children) == 2:
+            key_node, value_node = type_children
+            self.key_type = type_node_to_type(key_node)
+            self.value_type = type_node_to_type(value_node)
         else:
             raise ValueError(
                 'Unexpected number of children: %d' % len(self.type_children))
@@ -1334,6 +1477,7 @@ class IdlMaplike(IdlIterableOrMaplikeOrSetlike):
 
 
 class IdlSetlike(IdlIterableOrMaplikeOrSetlike):
+    __slots__ = ('is_read_only', 'value_type')
     idl_type_attributes = ('value_type', )
 
     def __init__(self, node):
@@ -1358,6 +1502,8 @@ class IdlSetlike(IdlIterableOrMaplikeOrSetlike):
 
 
 class IdlIncludes(object):
+    __slots__ = ('interface', 'mixin')
+
     def __init__(self, node):
         self.interface = node.GetName()
         self.mixin = node.GetProperty('REFERENCE')
@@ -1377,6 +1523,7 @@ class Exposure:
     Exposure(e, r) corresponds to [Exposed(e r)]. Exposure(e) corresponds to
     [Exposed=e].
     """
+    __slots__ = ('exposed', 'runtime_enabled')
 
     def __init__(self, exposed, runtime_enabled=None):
         self.exposed = exposed
@@ -1425,44 +1572,8 @@ def ext_attributes_node_to_extended_attributes(node):
     for extended_attribute_node in extended_attribute_node_list:
         name = extended_attribute_node.GetName()
         child = child_node(extended_attribute_node)
-        child_class = child and child.GetClass()
-        if name == 'Constructor':
-            raise ValueError('[Constructor] is deprecated. Use constructor '
-                             'operations')
-        elif name == 'CustomConstructor':
-            raise ValueError('[CustomConstructor] is deprecated. Use '
-                             'constructor operations with [Custom]')
-        elif name == 'NamedConstructor':
-            if child_class and child_class != 'Call':
-                raise ValueError(
-                    '[NamedConstructor] only supports Call as child, but has child of class: %s'
-                    % child_class)
-            extended_attributes[name] = child
-        elif name == 'Exposed':
-            if child_class and child_class != 'Arguments':
-                raise ValueError(
-                    '[Exposed] only supports Arguments as child, but has child of class: %s'
-                    % child_class)
-            exposures = []
-            if child_class == 'Arguments':
-                exposures = [
-                    Exposure(
-                        exposed=str(arg.idl_type), runtime_enabled=arg.name)
-                    for arg in arguments_node_to_arguments(child)
-                ]
-            else:
-                value = extended_attribute_node.GetProperty('VALUE')
-                if type(value) is str:
-                    exposures = [Exposure(exposed=value)]
-                else:
-                    exposures = [Exposure(exposed=v) for v in value]
-            extended_attributes[name] = exposures
-        elif child:
-            raise ValueError(
-                'ExtAttributes node with unexpected children: %s' % name)
-        else:
-            value = extended_attribute_node.GetProperty('VALUE')
-            extended_attributes[name] = value
+        handler = _EXT_ATTRIBUTE_HANDLERS.get(name, _ext_attribute_value)
+        extended_attributes[name] = handler(extended_attribute_node, child)
 
     # Store constructors and custom constructors in special list attributes,
     # which are deleted later. Note plural in key.
@@ -1474,6 +1585,61 @@ def ext_attributes_node_to_extended_attributes(node):
     return extended_attributes
 
 
+def _ext_attribute_constructor(extended_attribute_node, child):
+    raise ValueError('[Constructor] is deprecated. Use constructor '
+                     'operations')
+
+
+def _ext_attribute_custom_constructor(extended_attribute_node, child):
+    raise ValueError('[CustomConstructor] is deprecated. Use '
+                     'constructor operations with [Custom]')
+
+
+def _ext_attribute_named_constructor(extended_attribute_node, child):
+    child_class = child and child.GetClass()
+    if child_class and child_class != 'Call':
+        raise ValueError(
+            '[NamedConstructor] only supports Call as child, but has child of class: %s'
+            % child_class)
+    return child
+
+
+def _ext_attribute_exposed(extended_attribute_node, child):
+    child_class = child and child.GetClass()
+    if child_class and child_class != 'Arguments':
+        raise ValueError(
+            '[Exposed] only supports Arguments as child, but has child of class: %s'
+            % child_class)
+    if child_class == 'Arguments':
+        # Build each argument in place rather than going through the list
+        # arguments_node_to_arguments() would return.
+        return [
+            Exposure(exposed=str(arg.idl_type), runtime_enabled=arg.name)
+            for arg in map(IdlArgument, child.GetChildren())
+        ]
+    value = extended_attribute_node.GetProperty('VALUE')
+    if type(value) is str:
+        return [Exposure(exposed=value)]
+    return [Exposure(exposed=v) for v in value]
+
+
+def _ext_attribute_value(extended_attribute_node, child):
+    if child:
+        raise ValueError('ExtAttributes node with unexpected children: %s' %
+                         extended_attribute_node.GetName())
+    return extended_attribute_node.GetProperty('VALUE')
+
+
+# Extended attribute name -> function returning its value. Any other name is
+# handled by _ext_attribute_value.
+_EXT_ATTRIBUTE_HANDLERS = {
+    'Constructor': _ext_attribute_constructor,
+    'CustomConstructor': _ext_attribute_custom_constructor,
+    'NamedConstructor': _ext_attribute_named_constructor,
+    'Exposed': _ext_attribute_exposed,
+}
+
+
 def extended_attributes_to_constructors(extended_attributes):
     """Returns constructors and custom_constructors (lists of IdlOperations).
 
@@ -1518,6 +1684,7 @@ class ConstructorOperation(object):
     """Represents a constructor operation. This is a tentative object used to
     create constructors in IdlInterface.
     """
+    __slots__ = ('constructor', 'extended_attributes', 'is_custom')
 
     def __init__(self, constructor, extended_attributes, is_custom):
         self.constructor = constructor
@@ -1545,20 +1712,15 @@ def constructor_operation_from_node(node):
     if not arguments_node:
         raise ValueError('Expected Arguments node for constructor operation')
 
-    if 'Custom' in extended_attributes:
-        if extended_attributes['Custom']:
-            raise ValueError('[Custom] should not have a value on constructor '
-                             'operations')
-        del extended_attributes['Custom']
-        constructor = IdlOperation.constructor_from_arguments_node(
-            'CustomConstructor', arguments_node)
-        return ConstructorOperation(
-            constructor, extended_attributes, is_custom=True)
-    else:
-        constructor = IdlOperation.constructor_from_arguments_node(
-            'Constructor', arguments_node)
-        return ConstructorOperation(
-            constructor, extended_attributes, is_custom=False)
+    custom = extended_attributes.pop('Custom', _MISSING)
+    is_custom = custom is not _MISSING
+    if is_custom and custom:
+        raise ValueError('[Custom] should not have a value on constructor '
+                         'operations')
+    constructor = IdlOperation.constructor_from_arguments_node(
+        'CustomConstructor' if is_custom else 'Constructor', arguments_node)
+    return ConstructorOperation(
+        constructor, extended_attributes, is_custom=is_custom)
 
 
 def check_constructor_operations_extended_attributes(current_attrs, new_attrs):
@@ -1580,32 +1742,39 @@ def convert_constructor_operations_extended_attributes(extended_attributes):
 
     converted = {}
     for name, value in extended_attributes.items():
-        if name == "CallWith":
-            converted["ConstructorCallWith"] = value
-        elif name == "RaisesException":
+        converted_name = _CONSTRUCTOR_EXT_ATTRIBUTE_NAMES.get(name)
+        if converted_name is None:
+            raise ValueError(
+                '[{}] is not supported on constructor operations'.format(name))
+        if name == 'RaisesException':
             if value:
                 raise ValueError(
                     '[RaisesException] should not have a value on '
                     'constructor operations')
-            converted["RaisesException"] = 'Constructor'
-        elif name == "MeasureAs":
-            converted["MeasureAs"] = value
-        elif name == "Measure":
-            converted["Measure"] = None
-        else:
-            raise ValueError(
-                '[{}] is not supported on constructor operations'.format(name))
+            value = 'Constructor'
+        elif name == 'Measure':
+            value = None
+        converted[converted_name] = value
 
     return converted
 
 
+# Constructor operation extended attribute -> name of the interface extended
+# attribute it becomes. The value is carried over except for RaisesException
+# and Measure, which are special-cased above.
+_CONSTRUCTOR_EXT_ATTRIBUTE_NAMES = {
+    'CallWith': 'ConstructorCallWith',
+    'RaisesException': 'RaisesException',
+    'MeasureAs': 'MeasureAs',
+    'Measure': 'Measure',
+}
+
+
 def clear_constructor_attributes(extended_attributes):
     # Deletes Constructor*s* (plural), sets Constructor (singular)
-    if 'Constructors' in extended_attributes:
-        del extended_attributes['Constructors']
+    if extended_attributes.pop('Constructors', _MISSING) is not _MISSING:
         extended_attributes['Constructor'] = None
-    if 'CustomConstructors' in extended_attributes:
-        del extended_attributes['CustomConstructors']
+    if extended_attributes.pop('CustomConstructors', _MISSING) is not _MISSING:
         extended_attributes['CustomConstructor'] = None
 
 
@@ -1616,45 +1785,78 @@ def clear_constructor_attributes(extended_attributes):
 
 def type_node_to_type(node):
     children = node.GetChildren()
-    if len(children) != 1 and len(children) != 2:
+    num_children = len(children)
+    if num_children != 1 and num_children != 2:
         raise ValueError(
-            'Type node expects 1 or 2 child(ren), got %d.' % len(children))
-
-    base_type = type_node_inner_to_type(children[0])
-    if len(children) == 2:
+            'Type node expects 1 or 2 child(ren), got %d.' % num_children)
+
+    # Same as type_node_inner_to_type(), inlined to save a call frame per
+    # level of nesting (sequence<Promise<record<...>>> recurses through here).
+    inner_node = children[0]
+    inner_class = inner_node.GetClass()
+    handler = _TYPE_NODE_INNER_HANDLERS.get(inner_class)
+    if handler is None:
+        raise ValueError('Unrecognized node class: %s' % inner_class)
+    base_type = handler(inner_node)
+    if num_children == 2:
         extended_attributes = ext_attributes_node_to_extended_attributes(
             children[1])
         base_type = IdlAnnotatedType(base_type, extended_attributes)
 
-    if node.GetProperty('NULLABLE'):
-        base_type = IdlNullableType(base_type)
-
-    return base_type
+    if not node.GetProperty('NULLABLE'):
+        return base_type
+    nullable_type = _NULLABLE_TYPE_POOL.get(id(base_type))
+    if nullable_type is None:
+        nullable_type = IdlNullableType(base_type)
+    return nullable_type
 
 
 def type_node_inner_to_type(node):
     node_class = node.GetClass()
-    # Note Type*r*ef, not Typedef, meaning the type is an identifier, thus
-    # either a typedef shorthand (but not a Typedef declaration itself) or an
-    # interface type. We do not distinguish these, and just use the type name.
-    if node_class in ['PrimitiveType', 'StringType', 'Typeref']:
-        # unrestricted syntax: unrestricted double | unrestricted float
-        is_unrestricted = bool(node.GetProperty('UNRESTRICTED'))
-        return IdlType(node.GetName(), is_unrestricted=is_unrestricted)
-    elif node_class == 'Any':
-        return IdlType('any')
-    elif node_class in ['Sequence', 'FrozenArray']:
-        return sequence_node_to_type(node)
-    elif node_class == 'UnionType':
-        return union_type_node_to_idl_union_type(node)
-    elif node_class == 'Promise':
-        return promise_node_to_type(node)
-        # idl_type = IdlType('Promise')
-        # idl_type.node = node
-        # return idl_type
-    elif node_class == 'Record':
-        return record_node_to_type(node)
-    raise ValueError('Unrecognized node class: %s' % node_class)
+    handler = _TYPE_NODE_INNER_HANDLERS.get(node_class)
+    if handler is None:
+        raise ValueError('Unrecognized node class: %s' % node_class)
+    return handler(node)
+
+# Shared IdlType instances for named (primitive, string and interface) types,
+# keyed by (name, is_unrestricted). IdlType is never mutated after
+# construction, so one instance can stand for every occurrence of a name.
+_NAMED_TYPE_POOL = {}
+
+def _make_named_type(name, is_unrestricted=False):
+    key = (name, is_unrestricted)
+    idl_type = _NAMED_TYPE_POOL.get(key)
+    if idl_type is None:
+        # Interned once here; every later occurrence reuses this instance.
+        name = sys.intern(name)
+        idl_type = _NAMED_TYPE_POOL[(name, is_unrestricted)] = IdlType(
+            name, is_unrestricted=is_unrestricted)
+    return idl_type
+
+for _name in TYPE_NAMES:
+    if _name.startswith('unrestricted '):
+        _make_named_type(_name[len('unrestricted '):], is_unrestricted=True)
+    else:
+        _make_named_type(_name)
+del _name
+
+# Shared IdlNullableType wrappers (DOMString?, long?, ...) around the pooled
+# WebIDL types above, keyed by id() of the pooled inner type, which lives as
+# long as the pool. IdlNullableType.resolve_typedefs rewrites inner_type in
+# place, so only these built-in names, which can never be typedefs, are
+# shared. any cannot be nullable.
+_NULLABLE_TYPE_POOL = {
+    id(_idl_type): IdlNullableType(_idl_type)
+    for _key, _idl_type in _NAMED_TYPE_POOL.items() if _key != ('any', False)
+}
+
+def named_type_node_to_type(node):
+    # unrestricted syntax: unrestricted double | unrestricted float
+    is_unrestricted = bool(node.GetProperty('UNRESTRICTED'))
+    return _make_named_type(node.GetName(), is_unrestricted)
+
+def any_node_to_type(node):
+    return _make_named_type('any')
 
 def promise_node_to_type(node):
     member_types = [
@@ -1665,27 +1867,29 @@ def promise_node_to_type(node):
 
 def record_node_to_type(node):
     children = node.GetChildren()
-    if len(children) != 2:
+    num_children = len(children)
+    if num_children != 2:
         raise ValueError('record<K,V> node expects exactly 2 children, got %d'
-                         % (len(children)))
-    key_child = children[0]
-    value_child = children[1]
+                         % num_children)
+    key_child, value_child = children
     if key_child.GetClass() != 'StringType':
         raise ValueError('Keys in record<K,V> nodes must be string types.')
-    if value_child.GetClass() != 'Type':
+    value_child_class = value_child.GetClass()
+    if value_child_class != 'Type':
         raise ValueError('Unrecognized node class for record<K,V> value: %s' %
-                         value_child.GetClass())
+                         value_child_class)
     return IdlRecordType(
-        IdlType(key_child.GetName()), type_node_to_type(value_child))
+        _make_named_type(key_child.GetName()), type_node_to_type(value_child))
 
 
 def sequence_node_to_type(node):
     children = node.GetChildren()
     class_name = node.GetClass()
-    if len(children) != 1:
+    num_children = len(children)
+    if num_children != 1:
         raise ValueError('%s node expects exactly 1 child, got %s' %
-                         (class_name, len(children)))
-    sequence_child = children[0]
+                         (class_name, num_children))
+    sequence_child, = children
     sequence_child_class = sequence_child.GetClass()
     if sequence_child_class != 'Type':
         raise ValueError('Unrecognized node class: %s' % sequence_child_class)
@@ -1703,10 +1907,11 @@ def sequence_node_to_type(node):
 
 def typedef_node_to_type(node):
     children = node.GetChildren()
-    if len(children) != 1:
+    num_children = len(children)
+    if num_children != 1:
         raise ValueError(
-            'Typedef node with %s children, expected 1' % len(children))
-    child = children[0]
+            'Typedef node with %s children, expected 1' % num_children)
+    child, = children
     child_class = child.GetClass()
     if child_class != 'Type':
         raise ValueError('Unrecognized node class: %s' % child_class)
@@ -1721,6 +1926,23 @@ def union_type_node_to_idl_union_type(node):
     return IdlUnionType(member_types)
 
 
+# Inner type node class -> converter. Note Type*r*ef, not Typedef, meaning the
+# type is an identifier, thus either a typedef shorthand (but not a Typedef
+# declaration itself) or an interface type. We do not distinguish these, and
+# just use the type name.
+_TYPE_NODE_INNER_HANDLERS = {
+    'PrimitiveType': named_type_node_to_type,
+    'StringType': named_type_node_to_type,
+    'Typeref': named_type_node_to_type,
+    'Any': any_node_to_type,
+    'Sequence': sequence_node_to_type,
+    'FrozenArray': sequence_node_to_type,
+    'UnionType': union_type_node_to_idl_union_type,
+    'Promise': promise_node_to_type,
+    'Record': record_node_to_type,
+}
+
+
 ################################################################################
 # Visitor
 ################################################################################
@@ -32,6 +32,8 @@ http://www.chromium.org/developers/design-documents/idl-compiler#TOC-Front-end
 """
 
 import os
+import functools
+import threading
 
 from IDLParserTool.idl_parser.idl_parser import ParseFile as parse_file
 from IDLParserTool.blink_idl_parser import BlinkIDLParser
@@ -55,8 +57,9 @@ def validate_blink_idl_definitions(idl_filename, idl_file_basename,
          definitions. There is no filename convention in this case.
        - Otherwise, an IDL file is invalid.
     """
-    targets = (list(definitions.interfaces.values()) + list(definitions.dictionaries.values()))
-    number_of_targets = len(targets)
+    interfaces = definitions.interfaces
+    dictionaries = definitions.dictionaries
+    number_of_targets = len(interfaces) + len(dictionaries)
     if number_of_targets > 1:
         raise Exception(
             'Expected exactly 1 definition in file {0}, but found {1}'.format(
@@ -68,7 +71,7 @@ def validate_blink_idl_definitions(idl_filename, idl_file_basename,
             raise Exception('No definition found in %s. (Missing semicolon?)' %
                             idl_filename)
         return
-    target = targets[0]
+    target = next(iter((interfaces or dictionaries).values()))
     if target.is_partial:
         return
     if (target.name != idl_file_basename
@@ -78,9 +81,25 @@ def validate_blink_idl_definitions(idl_filename, idl_file_basename,
             format(target.name, idl_file_basename))
 
 
+@functools.lru_cache(maxsize=4)
+def _get_parser(outputdir):
+    return BlinkIDLParser(outputdir=outputdir)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_extended_attribute_validator():
+    # Only reads the list of valid extended attributes, so one is enough.
+    return IDLExtendedAttributeValidator()
+
+
+# BlinkIDLParser keeps per-parse state (lexer input, error counts), and
+# parsers are shared between IdlReader instances.
+_parse_lock = threading.Lock()
+
+
 class IdlReader(object):
     def __init__(self, interfaces_info=None, outputdir=''):
-        self.extended_attribute_validator = IDLExtendedAttributeValidator()
+        self.extended_attribute_validator = _get_extended_attribute_validator()
         self.interfaces_info = interfaces_info
 
         if interfaces_info:
@@ -89,7 +108,7 @@ class IdlReader(object):
         else:
             self.interface_dependency_resolver = None
 
-        self.parser = BlinkIDLParser(outputdir=outputdir)
+        self.parser = _get_parser(outputdir)
 
     def read_idl_definitions(self, idl_filename):
         """Returns a dictionary whose key is component and value is an IdlDefinitions object for an IDL file, including all dependencies."""
@@ -107,25 +126,28 @@ class IdlReader(object):
         return self.interface_dependency_resolver.resolve_dependencies(
             definitions, component)
 
-    def read_idl_file(self, idl_filename):
+    def read_idl_file(self, idl_filename, idl_file_basename=None):
         """Returns an IdlDefinitions object for an IDL file, without any dependencies.
 
         The IdlDefinitions object is guaranteed to contain a single
         IdlInterface; it may also contain other definitions, such as
-        callback functions and enumerations."""
-        ast = parse_file(self.parser, idl_filename)
+        callback functions and enumerations.
+
+        |idl_file_basename| is the file name without directory or extension;
+        callers that already have it can pass it to skip recomputing it."""
+        with _parse_lock:
+            ast = parse_file(self.parser, idl_filename)
         if not ast:
             raise Exception('Failed to parse %s' % idl_filename)
-        idl_file_basename, _ = os.path.splitext(os.path.basename(idl_filename))
+        if idl_file_basename is None:
+            idl_file_basename, _ = os.path.splitext(
+                os.path.basename(idl_filename))
         definitions = IdlDefinitions(ast)
 
         validate_blink_idl_definitions(idl_filename, idl_file_basename,
                                        definitions)
 
         # Validate extended attributes
-        if not self.extended_attribute_validator:
-            return definitions
-
         try:
             self.extended_attribute_validator.validate_extended_attributes(
                 definitions)
@@ -265,6 +265,12 @@ class IdlType(IdlTypeBase):
     def is_record_type(self):
         return False
 
+    @property
+    def is_sequence_type(self):
+        # Answered here rather than through IdlTypeBase.__getattr__, which is
+        # only reached after a failed attribute lookup.
+        return False
+
     @property
     def name(self):
         """Return type name